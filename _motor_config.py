@@ -0,0 +1,43 @@
+"""Motor layout shared by the scripts that talk to a FeetechMotorsBus directly.
+
+`MOTORS` and `sync_read_block` need lerobot, which imports torch, so they are resolved
+on first use; importing just the names and IDs stays cheap.
+"""
+MOTOR_MODEL = "sts3215"
+MOTOR_NAMES = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
+MOTOR_IDS = {name: i + 1 for i, name in enumerate(MOTOR_NAMES)}
+
+
+def __getattr__(name):
+    if name == "MOTORS":
+        from lerobot.motors.motors_bus import Motor, MotorNormMode
+
+        global MOTORS
+        MOTORS = {
+            motor_name: Motor(id=id_, model=MOTOR_MODEL, norm_mode=MotorNormMode.RANGE_M100_100)
+            for motor_name, id_ in MOTOR_IDS.items()
+        }
+        return MOTORS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def sync_read_block(bus, data_names):
+    """Read several registers from every motor in a single sync_read packet.
+
+    Requests the address range spanning all registers in one bus round-trip and
+    slices each register out of the reply, instead of one sync_read per register.
+    """
+    from lerobot.motors.motors_bus import get_address
+
+    addresses = {data_name: get_address(bus.model_ctrl_table, MOTOR_MODEL, data_name) for data_name in data_names}
+    start = min(addr for addr, _ in addresses.values())
+    length = max(addr + size for addr, size in addresses.values()) - start
+    ids = list(MOTOR_IDS.values())
+    bus._sync_read(start, length, ids, err_msg=f"Failed to sync read {data_names} on {ids=}.")
+
+    values = {}
+    for data_name, (addr, size) in addresses.items():
+        raw = {id_: bus.sync_reader.getData(id_, addr, size) for id_ in ids}
+        decoded = bus._decode_sign(data_name, raw)
+        values[data_name] = {name: decoded[id_] for name, id_ in MOTOR_IDS.items()}
+    return values
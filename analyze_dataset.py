@@ -1,23 +1,77 @@
 #!/usr/bin/env python3
 """Analyze robot demonstration dataset for consistency."""
 
+from functools import lru_cache
+
 from datasets import load_dataset
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Figures are only saved to PNG, never shown
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 
 # Motor names for the SO-101 arm
 MOTOR_NAMES = ['shoulder_pan', 'shoulder_lift', 'elbow_flex', 'wrist_flex', 'wrist_roll', 'gripper']
 
+# Below this many samples the Numba import and JIT compile cost more than they save
+NUMBA_MIN_SAMPLES = 1_000_000
+
+
+def episode_means(data, starts, lengths):
+    """Per-episode mean of each column, for contiguous episodes."""
+    if len(data) >= NUMBA_MIN_SAMPLES:
+        kernel = _episode_means_numba()
+        if kernel is not None:
+            return kernel(data, starts, lengths)
+    return np.add.reduceat(data, starts, axis=0, dtype=np.float64) / lengths[:, None]
+
+
+@lru_cache(maxsize=1)
+def _episode_means_numba():
+    """Build the Numba kernel on first use, or return None if Numba isn't installed."""
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def kernel(data, starts, lengths):
+        # One pass per episode (episodes in parallel), accumulating in float64
+        num_episodes, num_cols = len(starts), data.shape[1]
+        means = np.empty((num_episodes, num_cols))
+        for ep in numba.prange(num_episodes):
+            sums = np.zeros(num_cols)
+            for row in range(starts[ep], starts[ep] + lengths[ep]):
+                for col in range(num_cols):
+                    sums[col] += data[row, col]
+            for col in range(num_cols):
+                means[ep, col] = sums[col] / lengths[ep]
+        return means
+
+    return kernel
+
+
 def main():
     print("Loading dataset...")
     ds = load_dataset('Jbutch/record-prod', split='train')
 
-    # Convert to numpy arrays
-    actions = np.array(ds['action'])
-    states = np.array(ds['observation.state'])
-    episode_indices = np.array(ds['episode_index'])
-
-    num_episodes = len(set(episode_indices))
+    # Convert to numpy arrays straight from the Arrow buffers (no per-row Python objects).
+    # Positions are kept as float32 (half the memory traffic of float64); reductions
+    # below accumulate in float64 so the statistics keep full precision.
+    ds = ds.with_format('numpy', columns=['action', 'observation.state', 'episode_index'])
+    actions = np.ascontiguousarray(ds['action'][:], dtype=np.float32)
+    states = np.ascontiguousarray(ds['observation.state'][:], dtype=np.float32)
+    episode_indices = ds['episode_index'][:]
+
+    # Group samples by episode once. LeRobot stores episodes contiguously, so the stable
+    # sort only runs for out-of-order data; after it every episode is one [start, end) block.
+    if np.any(np.diff(episode_indices) < 0):
+        order = np.argsort(episode_indices, kind='stable')
+        actions, states, episode_indices = actions[order], states[order], episode_indices[order]
+    _, episode_starts, episode_lengths = np.unique(episode_indices, return_index=True, return_counts=True)
+    episode_slices = [slice(start, start + length) for start, length in zip(episode_starts, episode_lengths)]
+    num_episodes = len(episode_slices)
     num_samples = len(ds)
 
     print(f"\n{'='*60}")
@@ -29,15 +83,19 @@ def main():
     print(f"Action dimensions: {actions.shape[1]}")
     print(f"State dimensions: {states.shape[1]}")
 
-    # Statistics per dimension
+    # Statistics per dimension, one reduction over all motors at a time
+    action_mean, action_std = actions.mean(axis=0, dtype=np.float64), actions.std(axis=0, dtype=np.float64)
+    action_min, action_max = actions.min(axis=0), actions.max(axis=0)
+    state_mean, state_std = states.mean(axis=0, dtype=np.float64), states.std(axis=0, dtype=np.float64)
+    state_min, state_max = states.min(axis=0), states.max(axis=0)
+
     print(f"\n{'='*60}")
     print("ACTION STATISTICS (per motor)")
     print(f"{'='*60}")
     print(f"{'Motor':<15} {'Mean':>10} {'Std':>10} {'Min':>10} {'Max':>10} {'Range':>10}")
     print("-" * 65)
     for i, name in enumerate(MOTOR_NAMES):
-        col = actions[:, i]
-        print(f"{name:<15} {col.mean():>10.2f} {col.std():>10.2f} {col.min():>10.2f} {col.max():>10.2f} {col.max()-col.min():>10.2f}")
+        print(f"{name:<15} {action_mean[i]:>10.2f} {action_std[i]:>10.2f} {action_min[i]:>10.2f} {action_max[i]:>10.2f} {action_max[i]-action_min[i]:>10.2f}")
 
     print(f"\n{'='*60}")
     print("STATE STATISTICS (per motor)")
@@ -45,28 +103,14 @@ def main():
     print(f"{'Motor':<15} {'Mean':>10} {'Std':>10} {'Min':>10} {'Max':>10} {'Range':>10}")
     print("-" * 65)
     for i, name in enumerate(MOTOR_NAMES):
-        col = states[:, i]
-        print(f"{name:<15} {col.mean():>10.2f} {col.std():>10.2f} {col.min():>10.2f} {col.max():>10.2f} {col.max()-col.min():>10.2f}")
+        print(f"{name:<15} {state_mean[i]:>10.2f} {state_std[i]:>10.2f} {state_min[i]:>10.2f} {state_max[i]:>10.2f} {state_max[i]-state_min[i]:>10.2f}")
 
     # Per-episode consistency analysis
     print(f"\n{'='*60}")
     print("EPISODE CONSISTENCY ANALYSIS")
     print(f"{'='*60}")
 
-    episode_lengths = []
-    episode_action_means = []
-    episode_action_stds = []
-
-    for ep in range(num_episodes):
-        mask = episode_indices == ep
-        ep_actions = actions[mask]
-        episode_lengths.append(len(ep_actions))
-        episode_action_means.append(ep_actions.mean(axis=0))
-        episode_action_stds.append(ep_actions.std(axis=0))
-
-    episode_lengths = np.array(episode_lengths)
-    episode_action_means = np.array(episode_action_means)
-    episode_action_stds = np.array(episode_action_stds)
+    episode_action_means = episode_means(actions, episode_starts, episode_lengths)
 
     print(f"\nEpisode lengths: {episode_lengths}")
     print(f"Length mean: {episode_lengths.mean():.1f}, std: {episode_lengths.std():.1f}")
@@ -87,51 +131,51 @@ def main():
     print(f"{'='*60}")
 
     # Figure 1: Action histograms
-    fig1, axes1 = plt.subplots(2, 3, figsize=(14, 8))
+    fig1, axes1 = plt.subplots(2, 3, figsize=(14, 8), layout='constrained')
     fig1.suptitle('Action Distribution by Motor (All Episodes)', fontsize=14, fontweight='bold')
 
     for i, (ax, name) in enumerate(zip(axes1.flat, MOTOR_NAMES)):
-        data = actions[:, i]
-        ax.hist(data, bins=50, edgecolor='black', alpha=0.7, color='steelblue')
-        ax.axvline(data.mean(), color='red', linestyle='--', linewidth=2, label=f'Mean: {data.mean():.1f}')
-        ax.axvline(data.mean() - data.std(), color='orange', linestyle=':', linewidth=1.5)
-        ax.axvline(data.mean() + data.std(), color='orange', linestyle=':', linewidth=1.5, label=f'±1 Std: {data.std():.1f}')
+        data, mean, std = actions[:, i], action_mean[i], action_std[i]
+        counts, edges = np.histogram(data, bins=50)
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black', alpha=0.7, color='steelblue')
+        ax.axvline(mean, color='red', linestyle='--', linewidth=2, label=f'Mean: {mean:.1f}')
+        ax.axvline(mean - std, color='orange', linestyle=':', linewidth=1.5)
+        ax.axvline(mean + std, color='orange', linestyle=':', linewidth=1.5, label=f'±1 Std: {std:.1f}')
         ax.set_xlabel('Position (degrees)')
         ax.set_ylabel('Frequency')
         ax.set_title(f'{name}')
         ax.legend(fontsize=8)
         ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-    fig1.savefig('outputs/action_histograms.png', dpi=150, bbox_inches='tight')
+    fig1.savefig('outputs/action_histograms.png', dpi=100, bbox_inches='tight')
     print("Saved: outputs/action_histograms.png")
 
     # Figure 2: State histograms
-    fig2, axes2 = plt.subplots(2, 3, figsize=(14, 8))
+    fig2, axes2 = plt.subplots(2, 3, figsize=(14, 8), layout='constrained')
     fig2.suptitle('State Distribution by Motor (All Episodes)', fontsize=14, fontweight='bold')
 
     for i, (ax, name) in enumerate(zip(axes2.flat, MOTOR_NAMES)):
-        data = states[:, i]
-        ax.hist(data, bins=50, edgecolor='black', alpha=0.7, color='forestgreen')
-        ax.axvline(data.mean(), color='red', linestyle='--', linewidth=2, label=f'Mean: {data.mean():.1f}')
-        ax.axvline(data.mean() - data.std(), color='orange', linestyle=':', linewidth=1.5)
-        ax.axvline(data.mean() + data.std(), color='orange', linestyle=':', linewidth=1.5, label=f'±1 Std: {data.std():.1f}')
+        data, mean, std = states[:, i], state_mean[i], state_std[i]
+        counts, edges = np.histogram(data, bins=50)
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black', alpha=0.7, color='forestgreen')
+        ax.axvline(mean, color='red', linestyle='--', linewidth=2, label=f'Mean: {mean:.1f}')
+        ax.axvline(mean - std, color='orange', linestyle=':', linewidth=1.5)
+        ax.axvline(mean + std, color='orange', linestyle=':', linewidth=1.5, label=f'±1 Std: {std:.1f}')
         ax.set_xlabel('Position (degrees)')
         ax.set_ylabel('Frequency')
         ax.set_title(f'{name}')
         ax.legend(fontsize=8)
         ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-    fig2.savefig('outputs/state_histograms.png', dpi=150, bbox_inches='tight')
+    fig2.savefig('outputs/state_histograms.png', dpi=100, bbox_inches='tight')
     print("Saved: outputs/state_histograms.png")
 
     # Figure 3: Per-episode comparison (boxplots)
-    fig3, axes3 = plt.subplots(2, 3, figsize=(14, 8))
+    fig3, axes3 = plt.subplots(2, 3, figsize=(14, 8), layout='constrained')
     fig3.suptitle('Action Distribution per Episode (Boxplots)', fontsize=14, fontweight='bold')
 
     for i, (ax, name) in enumerate(zip(axes3.flat, MOTOR_NAMES)):
-        episode_data = [actions[episode_indices == ep, i] for ep in range(num_episodes)]
+        episode_data = [actions[episode, i] for episode in episode_slices]
         bp = ax.boxplot(episode_data, patch_artist=True)
         for patch in bp['boxes']:
             patch.set_facecolor('lightblue')
@@ -140,34 +184,33 @@ def main():
         ax.set_title(f'{name}')
         ax.grid(True, alpha=0.3, axis='y')
 
-    plt.tight_layout()
-    fig3.savefig('outputs/episode_boxplots.png', dpi=150, bbox_inches='tight')
+    fig3.savefig('outputs/episode_boxplots.png', dpi=100, bbox_inches='tight')
     print("Saved: outputs/episode_boxplots.png")
 
     # Figure 4: Time series overlay for each motor
-    fig4, axes4 = plt.subplots(2, 3, figsize=(14, 8))
+    fig4, axes4 = plt.subplots(2, 3, figsize=(14, 8), layout='constrained')
     fig4.suptitle('Action Trajectories Overlaid (All Episodes)', fontsize=14, fontweight='bold')
 
     colors = plt.cm.tab10(np.linspace(0, 1, num_episodes))
+    # Normalize time to [0, 1] for overlay
+    episode_times = [np.linspace(0, 1, length) for length in episode_lengths]
 
     for i, (ax, name) in enumerate(zip(axes4.flat, MOTOR_NAMES)):
-        for ep in range(num_episodes):
-            mask = episode_indices == ep
-            ep_actions = actions[mask, i]
-            # Normalize time to [0, 1] for overlay
-            t = np.linspace(0, 1, len(ep_actions))
-            ax.plot(t, ep_actions, color=colors[ep], alpha=0.6, linewidth=1, label=f'Ep {ep}')
+        # One collection per axis instead of a Line2D artist per episode
+        segments = [np.column_stack([t, actions[episode, i]]) for t, episode in zip(episode_times, episode_slices)]
+        ax.add_collection(LineCollection(segments, colors=colors, alpha=0.6, linewidths=1))
+        ax.autoscale_view()
         ax.set_xlabel('Normalized Time')
         ax.set_ylabel('Position (degrees)')
         ax.set_title(f'{name}')
         ax.grid(True, alpha=0.3)
 
     # Add single legend
-    handles, labels = axes4.flat[0].get_legend_handles_labels()
-    fig4.legend(handles, labels, loc='upper right', ncol=5, fontsize=8)
+    handles = [Line2D([], [], color=color, alpha=0.6, linewidth=1) for color in colors]
+    labels = [f'Ep {ep}' for ep in range(num_episodes)]
+    fig4.legend(handles, labels, loc='outside upper right', ncol=5, fontsize=8)
 
-    plt.tight_layout(rect=[0, 0, 1, 0.95])
-    fig4.savefig('outputs/trajectory_overlay.png', dpi=150, bbox_inches='tight')
+    fig4.savefig('outputs/trajectory_overlay.png', dpi=100, bbox_inches='tight')
     print("Saved: outputs/trajectory_overlay.png")
 
     print(f"\n{'='*60}")
@@ -175,8 +218,8 @@ def main():
     print(f"{'='*60}")
 
     # Overall consistency score based on coefficient of variation
-    cv_actions = actions.std(axis=0) / (np.abs(actions.mean(axis=0)) + 1e-6)
-    cv_states = states.std(axis=0) / (np.abs(states.mean(axis=0)) + 1e-6)
+    cv_actions = action_std / (np.abs(action_mean) + 1e-6)
+    cv_states = state_std / (np.abs(state_mean) + 1e-6)
 
     print("\nCoefficient of Variation (lower = more consistent):")
     print(f"{'Motor':<15} {'Action CV':>12} {'State CV':>12}")
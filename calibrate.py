@@ -1,22 +1,24 @@
 #!/usr/bin/env python3
 """Calibrate SO-101 arms."""
+import argparse
 import os
 
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.prompt import Prompt
 
-from lerobot.teleoperators.so_leader import SO101LeaderConfig, SO101Leader
-from lerobot.robots.so_follower import SO101FollowerConfig, SO101Follower
-
 load_dotenv()
 
 console = Console()
 LEADER_PORT = os.getenv("LEADER_ARM_PORT")
 FOLLOWER_PORT = os.getenv("FOLLOWER_ARM_PORT")
+ARMS = {"1": "leader", "2": "follower", "3": "both"}
 
 
 def calibrate_leader():
+    # Imported here so calibrating only the follower (or --help) skips the leader's import graph
+    from lerobot.teleoperators.so_leader import SO101LeaderConfig, SO101Leader
+
     console.print(f"[bold]Calibrating leader[/bold] [dim]({LEADER_PORT})[/dim]")
     leader = SO101Leader(SO101LeaderConfig(port=LEADER_PORT, id="leader_arm"))
     leader.connect(calibrate=False)
@@ -26,6 +28,8 @@ def calibrate_leader():
 
 
 def calibrate_follower():
+    from lerobot.robots.so_follower import SO101FollowerConfig, SO101Follower
+
     console.print(f"[bold]Calibrating follower[/bold] [dim]({FOLLOWER_PORT})[/dim]")
     follower = SO101Follower(SO101FollowerConfig(port=FOLLOWER_PORT, id="follower_arm"))
     follower.connect(calibrate=False)
@@ -41,20 +45,23 @@ def select_arm():
     console.print(f"  [cyan]2[/cyan] Follower [dim]({FOLLOWER_PORT})[/dim]")
     console.print(f"  [cyan]3[/cyan] Both")
 
-    return Prompt.ask("Choice", choices=["1", "2", "3"])
+    return ARMS[Prompt.ask("Choice", choices=list(ARMS))]
 
 
-if __name__ == "__main__":
-    choice = select_arm()
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--arm", choices=list(ARMS.values()), help="arm to calibrate (prompts if omitted)")
+    args = parser.parse_args()
 
-    if choice == "1" and LEADER_PORT:
+    arm = args.arm or select_arm()
+
+    if arm in ("leader", "both") and LEADER_PORT:
         calibrate_leader()
-    elif choice == "2" and FOLLOWER_PORT:
+    if arm in ("follower", "both") and FOLLOWER_PORT:
         calibrate_follower()
-    elif choice == "3":
-        if LEADER_PORT:
-            calibrate_leader()
-        if FOLLOWER_PORT:
-            calibrate_follower()
 
     console.print("[bold green]Done[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,14 @@ from lerobot.cameras.configs import ColorMode, Cv2Rotation
 from lerobot.cameras.opencv.camera_opencv import OpenCVCamera
 from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
 from lerobot.motors.feetech import FeetechMotorsBus
-from lerobot.motors.motors_bus import Motor, MotorNormMode
+from lerobot.motors.motors_bus import Motor, MotorNormMode, get_address
+
+try:
+    from turbojpeg import TJPF_BGR, TurboJPEG
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    # PyTurboJPEG or the libjpeg-turbo shared library is missing; fall back to cv2
+    turbo_jpeg = None
 
 load_dotenv()
 
@@ -23,25 +30,41 @@ CAMERA_CONFIG = OpenCVCameraConfig(
     fps=15,
     width=1920,
     height=1080,
-    color_mode=ColorMode.RGB,
+    color_mode=ColorMode.BGR,  # OpenCV's native order, so frames need no conversion before encoding
     rotation=Cv2Rotation.NO_ROTATION,
 )
+# The dashboard shows the feed at column width (~1100px max), so stream a half-size preview
+PREVIEW_SIZE = (960, 540)
+JPEG_QUALITY = 70  # Visually indistinguishable from 80 in the browser at ~15% fewer bytes
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
 
 # Motor configuration
 LEADER_PORT = os.getenv("LEADER_ARM_PORT")
 FOLLOWER_PORT = os.getenv("FOLLOWER_ARM_PORT")
 MOTOR_NAMES = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
 MOTOR_IDS = {name: i + 1 for i, name in enumerate(MOTOR_NAMES)}
+# Registers shown on the dashboard; on the sts3215 they all sit in addresses 56-70
+STATUS_REGISTERS = ["Present_Voltage", "Present_Temperature", "Present_Load", "Present_Current", "Present_Position"]
 
 # Global state
 camera = None
 camera_lock = threading.Lock()
 
+# Latest frame as (sequence number, multipart MJPEG chunk), shared by all stream clients
+latest_frame = (0, None)
+frame_condition = threading.Condition()
+# Open /video_feed streams; frames are only captured and encoded while this is non-zero
+viewer_count = 0
+
 robot_state = {
     "leader": {"connected": False, "bus": None, "data": {}},
     "follower": {"connected": False, "bus": None, "data": {}},
 }
 robot_lock = threading.Lock()
+# Serialize traffic on each arm's serial port: the poller's reads against /reconnect's disconnect
+bus_locks = {"leader": threading.Lock(), "follower": threading.Lock()}
+# /robot_data response body, re-serialized by the polling thread once per tick
+robot_state_json = b""
 
 
 def create_bus(port):
@@ -54,22 +77,44 @@ def create_bus(port):
     )
 
 
+def sync_read_block(bus, data_names):
+    """Read several registers from every motor in a single sync_read packet.
+
+    Requests the address range spanning all registers in one bus round-trip and
+    slices each register out of the reply, instead of one sync_read per register.
+    """
+    addresses = {data_name: get_address(bus.model_ctrl_table, "sts3215", data_name) for data_name in data_names}
+    start = min(addr for addr, _ in addresses.values())
+    length = max(addr + size for addr, size in addresses.values()) - start
+    ids = list(MOTOR_IDS.values())
+    bus._sync_read(start, length, ids, err_msg=f"Failed to sync read {data_names} on {ids=}.")
+
+    values = {}
+    for data_name, (addr, size) in addresses.items():
+        raw = {id_: bus.sync_reader.getData(id_, addr, size) for id_ in ids}
+        decoded = bus._decode_sign(data_name, raw)
+        values[data_name] = {name: decoded[id_] for name, id_ in MOTOR_IDS.items()}
+    return values
+
+
 def connect_camera():
     """Connect to camera using lerobot API."""
     global camera
     with camera_lock:
-        if camera is not None:
+        # Readers don't take the lock, so unpublish the old camera before tearing it down
+        old_camera, camera = camera, None
+        if old_camera is not None:
             try:
-                camera.disconnect()
+                old_camera.disconnect()
             except Exception:
                 pass
         try:
-            camera = OpenCVCamera(CAMERA_CONFIG)
-            camera.connect()
+            new_camera = OpenCVCamera(CAMERA_CONFIG)
+            new_camera.connect()
+            camera = new_camera
             print("Camera connected")
         except Exception as e:
             print(f"Failed to connect camera: {e}")
-            camera = None
 
 
 def connect_robots():
@@ -88,38 +133,79 @@ def connect_robots():
                     robot_state[arm]["connected"] = False
 
 
-def read_robot_data():
-    """Read data from connected robots."""
+def snapshot_robot_state():
+    """Return the connection status and latest data of both arms."""
+    # Data dicts are replaced, never mutated, so the snapshot can be used outside the lock
     with robot_lock:
-        for arm in ["leader", "follower"]:
-            if robot_state[arm]["connected"] and robot_state[arm]["bus"]:
-                try:
-                    bus = robot_state[arm]["bus"]
-                    voltage = bus.sync_read("Present_Voltage", normalize=False)
-                    temp = bus.sync_read("Present_Temperature", normalize=False)
-                    load = bus.sync_read("Present_Load", normalize=False)
-                    current = bus.sync_read("Present_Current", normalize=False)
-                    position = bus.sync_read("Present_Position", normalize=False)
-
-                    motors = {}
-                    for name in MOTOR_NAMES:
-                        motors[name] = {
-                            "voltage": voltage[name] / 10,
-                            "temp": temp[name],
-                            "load": load[name],
-                            "current": current[name],
-                            "position": position[name],  # Raw 0-4095 value
-                        }
-
-                    robot_state[arm]["data"] = {
-                        "motors": motors,
-                        "min_voltage": min(m["voltage"] for m in motors.values()),
-                        "max_temp": max(m["temp"] for m in motors.values()),
-                        "timestamp": time.time(),
-                    }
-                except Exception as e:
-                    print(f"Error reading {arm} arm: {e}")
-                    robot_state[arm]["connected"] = False
+        return {
+            "leader": {
+                "connected": robot_state["leader"]["connected"],
+                "data": robot_state["leader"]["data"],
+            },
+            "follower": {
+                "connected": robot_state["follower"]["connected"],
+                "data": robot_state["follower"]["data"],
+            },
+        }
+
+
+def read_robot_data():
+    """Read data from connected robots.
+
+    The bus reads run under the arm's bus lock rather than robot_lock; robot_lock is only
+    held to pick up the bus and to publish the new data, so /robot_data never waits on
+    the serial port.
+    """
+    global robot_state_json
+    for arm in ["leader", "follower"]:
+        with robot_lock:
+            bus = robot_state[arm]["bus"] if robot_state[arm]["connected"] else None
+        if bus is None:
+            continue
+
+        try:
+            with bus_locks[arm]:
+                # /reconnect may have closed the bus since it was picked up
+                if not bus.is_connected:
+                    continue
+                status = sync_read_block(bus, STATUS_REGISTERS)
+            voltage = status["Present_Voltage"]
+            temp = status["Present_Temperature"]
+            load = status["Present_Load"]
+            current = status["Present_Current"]
+            position = status["Present_Position"]
+
+            motors = {}
+            for name in MOTOR_NAMES:
+                motors[name] = {
+                    "voltage": voltage[name] / 10,
+                    "temp": temp[name],
+                    "load": load[name],
+                    "current": current[name],
+                    "position": position[name],  # Raw 0-4095 value
+                }
+
+            data = {
+                "motors": motors,
+                "min_voltage": min(m["voltage"] for m in motors.values()),
+                "max_temp": max(m["temp"] for m in motors.values()),
+                "timestamp": time.time(),
+            }
+        except Exception as e:
+            print(f"Error reading {arm} arm: {e}")
+            data = None
+
+        with robot_lock:
+            # Skip publishing if /reconnect replaced the bus while we were reading
+            if robot_state[arm]["bus"] is not bus:
+                continue
+            if data is None:
+                robot_state[arm]["connected"] = False
+            else:
+                robot_state[arm]["data"] = data
+
+    # Serialize once here rather than once per /robot_data request
+    robot_state_json = json.dumps(snapshot_robot_state()).encode()
 
 
 HTML_TEMPLATE = """
@@ -399,31 +485,71 @@ HTML_TEMPLATE = """
 """
 
 
-def generate_frames():
-    """Generate frames using lerobot camera API."""
-    global camera
+def encode_jpeg(frame):
+    """Encode a BGR frame as JPEG, returning a bytes-like buffer or None on failure."""
+    if turbo_jpeg is not None:
+        return turbo_jpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR)
 
+    # No extra Huffman optimization pass; the buffer is returned without a tobytes() copy
+    params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+    ret, buffer = cv2.imencode('.jpg', frame, params)
+    return buffer if ret else None
+
+
+def camera_capture_thread():
+    """Background thread to read and encode each camera frame once for all viewers."""
+    global latest_frame
     while True:
-        with camera_lock:
-            if camera is None:
-                time.sleep(0.1)
-                continue
-            try:
-                # async_read returns RGB numpy array
-                frame = camera.async_read(timeout_ms=200)
-                # Convert RGB to BGR for cv2.imencode
-                frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            except Exception as e:
-                print(f"Camera read error: {e}")
-                time.sleep(0.1)
-                continue
+        # Idle until a browser is watching, so an unviewed dashboard costs no encoding
+        with frame_condition:
+            frame_condition.wait_for(lambda: viewer_count > 0)
+
+        # async_read is thread-safe, so only snapshot the reference; camera_lock guards the swap
+        cam = camera
+        if cam is None:
+            time.sleep(0.1)
+            continue
+        try:
+            # async_read returns BGR numpy array (see CAMERA_CONFIG)
+            frame = cam.async_read(timeout_ms=200)
+        except Exception as e:
+            print(f"Camera read error: {e}")
+            time.sleep(0.1)
+            continue
 
-        ret, buffer = cv2.imencode('.jpg', frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, 80])
-        if not ret:
+        # INTER_AREA is the fast, alias-free choice for an integer-ratio shrink
+        preview = cv2.resize(frame, PREVIEW_SIZE, interpolation=cv2.INTER_AREA)
+        jpeg = encode_jpeg(preview)
+        if jpeg is None:
             continue
 
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+        # Assemble the multipart chunk once here (a single copy) instead of once per client
+        chunk = b''.join((MJPEG_PART_HEADER, jpeg, b'\r\n'))
+        with frame_condition:
+            latest_frame = (latest_frame[0] + 1, chunk)
+            frame_condition.notify_all()
+
+
+def generate_frames():
+    """Stream the frames published by camera_capture_thread to one client."""
+    global viewer_count
+    with frame_condition:
+        viewer_count += 1
+        # Start from the next frame, not whatever was left over from the last viewer
+        last_seq = latest_frame[0]
+        frame_condition.notify_all()
+    try:
+        while True:
+            with frame_condition:
+                if not frame_condition.wait_for(lambda: latest_frame[0] != last_seq, timeout=1.0):
+                    continue
+                last_seq, chunk = latest_frame
+
+            yield chunk
+    finally:
+        # Runs when the client disconnects and the server closes the generator
+        with frame_condition:
+            viewer_count -= 1
 
 
 def robot_polling_thread():
@@ -448,47 +574,40 @@ def video_feed():
 
 @app.route('/robot_data')
 def robot_data():
-    with robot_lock:
-        return jsonify({
-            "leader": {
-                "connected": robot_state["leader"]["connected"],
-                "data": robot_state["leader"]["data"],
-            },
-            "follower": {
-                "connected": robot_state["follower"]["connected"],
-                "data": robot_state["follower"]["data"],
-            },
-        })
+    body = robot_state_json or json.dumps(snapshot_robot_state()).encode()
+    return Response(body, mimetype='application/json', headers={'Cache-Control': 'no-store'})
 
 
 @app.route('/reconnect', methods=['POST'])
 def reconnect():
-    # Disconnect existing
+    # Unpublish the existing buses, then disconnect them once no read is in flight
     with robot_lock:
-        for arm in ["leader", "follower"]:
-            if robot_state[arm]["bus"]:
+        old_buses = {arm: robot_state[arm]["bus"] for arm in ["leader", "follower"]}
+        for arm in old_buses:
+            robot_state[arm]["bus"] = None
+            robot_state[arm]["connected"] = False
+    for arm, bus in old_buses.items():
+        if bus:
+            with bus_locks[arm]:
                 try:
-                    robot_state[arm]["bus"].disconnect()
+                    bus.disconnect()
                 except Exception:
                     pass
-                robot_state[arm]["bus"] = None
-                robot_state[arm]["connected"] = False
 
     # Reconnect
     connect_robots()
     return jsonify({"status": "ok"})
 
 
-def find_available_port(start_port=5001, max_attempts=100):
-    """Find an available port starting from start_port."""
-    for port in range(start_port, start_port + max_attempts):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            try:
-                s.bind(('0.0.0.0', port))
-                return port
-            except OSError:
-                continue
-    raise RuntimeError(f"No available port found in range {start_port}-{start_port + max_attempts}")
+def find_available_port(preferred_port=5001):
+    """Return preferred_port if it is free, otherwise a free port picked by the OS."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(('0.0.0.0', preferred_port))
+        except OSError:
+            # Port 0 makes the kernel assign a free ephemeral port in one call
+            s.bind(('0.0.0.0', 0))
+        return s.getsockname()[1]
 
 
 if __name__ == '__main__':
@@ -498,7 +617,9 @@ if __name__ == '__main__':
     print("Connecting to robot arms...")
     connect_robots()
 
-    # Start background polling thread
+    # Start background capture and polling threads
+    capture_thread = threading.Thread(target=camera_capture_thread, daemon=True)
+    capture_thread.start()
     polling_thread = threading.Thread(target=robot_polling_thread, daemon=True)
     polling_thread.start()
 
@@ -5,19 +5,21 @@ import os
 import sys
 from datetime import datetime
 
+import torch
 from dotenv import load_dotenv
 
 from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.datasets.pipeline_features import aggregate_pipeline_dataset_features, create_initial_features
-from lerobot.datasets.utils import combine_feature_dicts
+from lerobot.datasets.utils import build_dataset_frame, combine_feature_dicts
 from lerobot.policies.act.modeling_act import ACTPolicy
 from lerobot.policies.factory import make_pre_post_processors
 from lerobot.processor import make_default_processors
 from lerobot.robots.so_follower import SO101FollowerConfig, SO101Follower
 from lerobot.scripts.lerobot_record import record_loop
-from lerobot.utils.control_utils import init_keyboard_listener
-from lerobot.utils.utils import log_say
+from lerobot.utils.constants import OBS_STR
+from lerobot.utils.control_utils import init_keyboard_listener, predict_action
+from lerobot.utils.utils import get_safe_torch_device, log_say
 
 # Load environment variables
 load_dotenv()
@@ -88,7 +90,27 @@ robot = SO101Follower(robot_config)
 print(f"Loading policy from {POLICY_REPO}...")
 policy = ACTPolicy.from_pretrained(POLICY_REPO)
 policy.to("mps")  # Use MPS on macOS
+policy.half()  # fp16 weights; autocast keeps LayerNorm/softmax in fp32
 policy.eval()
+
+select_action = policy.select_action
+
+
+def select_action_fp16(batch):
+    # The preprocessor hands over fp32 tensors and autocast casts them per op. The action
+    # goes back as fp32 so the unnormalizer keeps its stats in fp32 instead of following it down.
+    # inference_mode skips autograd bookkeeping whichever code path ends up calling the policy.
+    with torch.inference_mode(), torch.autocast(device_type="mps", dtype=torch.float16):
+        return select_action(batch).float()
+
+
+policy.select_action = select_action_fp16
+
+# Compile the ACT model to cut eager-mode dispatch overhead in the 30 FPS loop.
+# "reduce-overhead" relies on CUDA graphs, so the default mode is used on MPS;
+# graph breaks fall back to eager instead of raising.
+torch._dynamo.config.suppress_errors = True
+policy.model = torch.compile(policy.model, dynamic=False)
 print("Policy loaded.")
 
 # Create default robot processors (needed for feature aggregation)
@@ -137,6 +159,24 @@ preprocessor, postprocessor = make_pre_post_processors(
 )
 
 try:
+    # Run one inference step on a live observation, the same way record_loop does, so the
+    # first episode doesn't pay the compile time (record_loop resets the policy on entry)
+    print("Warming up policy...")
+    observation_frame = build_dataset_frame(
+        dataset.features, robot_observation_processor(robot.get_observation()), prefix=OBS_STR
+    )
+    predict_action(
+        observation=observation_frame,
+        policy=policy,
+        device=get_safe_torch_device(policy.config.device),
+        preprocessor=preprocessor,
+        postprocessor=postprocessor,
+        use_amp=policy.config.use_amp,
+        task=TASK_DESCRIPTION,
+        robot_type=robot.robot_type,
+    )
+    print("Policy ready.")
+
     for episode_idx in range(NUM_EPISODES):
         if events["stop_recording"]:
             break
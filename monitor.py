@@ -2,26 +2,64 @@
 """Monitor motor voltage, temperature, current, and load."""
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from lerobot.motors.feetech import FeetechMotorsBus
-from lerobot.motors.motors_bus import Motor, MotorNormMode
+from rich.live import Live
+from rich.table import Table
+
+from _motor_config import MOTOR_NAMES, MOTORS, sync_read_block
 
 load_dotenv()
 
 LEADER_PORT = os.getenv("LEADER_ARM_PORT")
 FOLLOWER_PORT = os.getenv("FOLLOWER_ARM_PORT")
-MOTOR_NAMES = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
-MOTOR_IDS = {name: i + 1 for i, name in enumerate(MOTOR_NAMES)}
+STATUS_REGISTERS = ["Present_Voltage", "Present_Temperature", "Present_Load", "Present_Current"]
 
 
 def create_bus(port):
-    return FeetechMotorsBus(
-        port=port,
-        motors={
-            name: Motor(id=id_, model="sts3215", norm_mode=MotorNormMode.RANGE_M100_100)
-            for name, id_ in MOTOR_IDS.items()
-        },
-    )
+    return FeetechMotorsBus(port=port, motors=MOTORS)
+
+
+def read_summary(bus):
+    """Return (min voltage, max temperature) across all motors."""
+    status = sync_read_block(bus, ["Present_Voltage", "Present_Temperature"])
+    return min(status["Present_Voltage"].values()) / 10, max(status["Present_Temperature"].values())
+
+
+def render_table(arm_name, status):
+    """Build the monitor table for one set of readings."""
+    # Readings as lists in MOTOR_NAMES order, which is the order sync_read_block returns
+    voltage = list(status["Present_Voltage"].values())
+    temp = list(status["Present_Temperature"].values())
+    load = list(status["Present_Load"].values())
+    current = list(status["Present_Current"].values())
+
+    table = Table(title=f"=== {arm_name.upper()} ARM MONITOR === (Ctrl+C to stop)")
+    table.add_column("Motor")
+    for column in ("Volt", "Temp", "Load", "Current"):
+        table.add_column(column, justify="right")
+
+    min_voltage = min(voltage)
+    max_temp = max(temp)
+
+    for name, v, t, l, c in zip(MOTOR_NAMES, voltage, temp, load, current):
+        # Voltage warning
+        v_str = f"{v/10:.1f}V"
+        if v < 60:  # Below 6V is danger zone
+            v_str = f"[red]{v_str} LOW![/red]"
+
+        table.add_row(name, v_str, f"{t}°C", str(l), str(c))
+
+    table.add_section()
+    table.add_row("SUMMARY", f"{min_voltage/10:.1f}V min", f"{max_temp}°C max", "", "")
+
+    if min_voltage < 60:
+        table.caption = "[bold red]*** WARNING: Voltage below 6V - motors may brown out! ***[/bold red]"
+    elif min_voltage < 65:
+        table.caption = "[yellow]* Caution: Voltage getting low[/yellow]"
+
+    return table
 
 
 def monitor(bus, arm_name, interval=0.5):
@@ -32,45 +70,12 @@ def monitor(bus, arm_name, interval=0.5):
     print("-" * 70)
 
     try:
-        while True:
-            voltage = bus.sync_read("Present_Voltage", normalize=False)
-            temp = bus.sync_read("Present_Temperature", normalize=False)
-            load = bus.sync_read("Present_Load", normalize=False)
-            current = bus.sync_read("Present_Current", normalize=False)
-
-            # Clear screen and print header
-            print("\033[2J\033[H")  # Clear screen
-            print(f"=== {arm_name.upper()} ARM MONITOR === (Ctrl+C to stop)")
-            print(f"{'Motor':<15} | {'Volt':>6} | {'Temp':>6} | {'Load':>6} | {'Current':>7}")
-            print("-" * 55)
-
-            min_voltage = 255
-            max_temp = 0
-
-            for name in MOTOR_NAMES:
-                v = voltage[name]
-                t = temp[name]
-                l = load[name]
-                c = current[name]
-                min_voltage = min(min_voltage, v)
-                max_temp = max(max_temp, t)
-
-                # Voltage warning
-                v_str = f"{v/10:.1f}V"
-                if v < 60:  # Below 6V is danger zone
-                    v_str += " LOW!"
-
-                print(f"{name:<15} | {v_str:>6} | {t:>4}°C | {l:>6} | {c:>7}")
-
-            print("-" * 55)
-            print(f"{'SUMMARY':<15} | {min_voltage/10:.1f}V min | {max_temp}°C max")
-
-            if min_voltage < 60:
-                print("\n*** WARNING: Voltage below 6V - motors may brown out! ***")
-            elif min_voltage < 65:
-                print("\n* Caution: Voltage getting low")
-
-            time.sleep(interval)
+        # Live redraws the table in place, rewriting only what changed, once per reading
+        with Live(auto_refresh=False) as live:
+            while True:
+                status = sync_read_block(bus, STATUS_REGISTERS)
+                live.update(render_table(arm_name, status), refresh=True)
+                time.sleep(interval)
 
     except KeyboardInterrupt:
         print("\n\nMonitoring stopped.")
@@ -95,33 +100,28 @@ def main():
         monitor(bus, "follower")
         bus.disconnect()
     elif choice == "3":
-        leader_bus = create_bus(LEADER_PORT)
-        follower_bus = create_bus(FOLLOWER_PORT)
-        leader_bus.connect()
-        follower_bus.connect()
-
-        try:
-            while True:
-                for bus, name in [(leader_bus, "leader"), (follower_bus, "follower")]:
-                    voltage = bus.sync_read("Present_Voltage", normalize=False)
-                    temp = bus.sync_read("Present_Temperature", normalize=False)
+        buses = [create_bus(LEADER_PORT), create_bus(FOLLOWER_PORT)]
 
-                    min_v = min(voltage.values()) / 10
-                    max_t = max(temp.values())
+        # The arms are on separate serial ports, so both can be connected and read at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda bus: bus.connect(), buses))
 
-                    status = ""
-                    if min_v < 6.0:
-                        status = " ** LOW VOLTAGE **"
-                    print(f"{name:8}: {min_v:.1f}V min, {max_t}°C max{status}")
+            try:
+                while True:
+                    summaries = executor.map(read_summary, buses)
+                    for name, (min_v, max_t) in zip(["leader", "follower"], summaries):
+                        status = ""
+                        if min_v < 6.0:
+                            status = " ** LOW VOLTAGE **"
+                        print(f"{name:8}: {min_v:.1f}V min, {max_t}°C max{status}")
 
-                print("-" * 40)
-                time.sleep(1)
+                    print("-" * 40)
+                    time.sleep(1)
 
-        except KeyboardInterrupt:
-            print("\nStopped.")
+            except KeyboardInterrupt:
+                print("\nStopped.")
 
-        leader_bus.disconnect()
-        follower_bus.disconnect()
+            list(executor.map(lambda bus: bus.disconnect(), buses))
     else:
         print("Invalid choice")
 
@@ -1,34 +1,74 @@
 #!/usr/bin/env python3
 """Plot variance analysis for robot demonstration dataset."""
 
+from pathlib import Path
+
 from datasets import load_dataset
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Figures are only saved to PNG, never shown
 import matplotlib.pyplot as plt
 
 MOTOR_NAMES = ['shoulder_pan', 'shoulder_lift', 'elbow_flex', 'wrist_flex', 'wrist_roll', 'gripper']
+MAX_PLOT_POINTS = 2000  # Rolling variance is strided down to about this many points per line
+CACHE_DIR = Path('cache')  # Delete to pick up a newer version of the dataset
+
+def rolling_variance(data, window):
+    """Per-column variance over the trailing window+1 samples (fewer at the start)."""
+    # Centre first so the prefix sums of squares don't cancel catastrophically
+    centred = data - data.mean(axis=0)
+    zero = np.zeros((1, data.shape[1]))
+    c1 = np.concatenate([zero, np.cumsum(centred, axis=0, dtype=np.float64)])
+    c2 = np.concatenate([zero, np.cumsum(centred * centred, axis=0, dtype=np.float64)])
+    ends = np.arange(1, len(data) + 1)
+    starts = np.maximum(0, ends - window - 1)
+    n = (ends - starts)[:, None]
+    mean = (c1[ends] - c1[starts]) / n
+    return np.maximum((c2[ends] - c2[starts]) / n - mean * mean, 0)
+
+def episode_mean_var(data, starts, lengths):
+    """Per-episode mean and variance of each column, for contiguous episodes."""
+    counts = lengths[:, None]
+    means = np.add.reduceat(data, starts, axis=0, dtype=np.float64) / counts
+    # Square in float64: float32 squares would leave rounding error in E[x²] - E[x]²
+    sq_means = np.add.reduceat(np.square(data, dtype=np.float64), starts, axis=0) / counts
+    return means, np.maximum(sq_means - means**2, 0)
+
+def load_columns():
+    """Return (actions, episode_indices), memory-mapped from the local .npy cache.
+
+    The first run pulls the columns out of the HuggingFace dataset and saves them.
+    """
+    actions_path = CACHE_DIR / 'actions.npy'
+    episodes_path = CACHE_DIR / 'episode_index.npy'
+    if not (actions_path.exists() and episodes_path.exists()):
+        ds = load_dataset('Jbutch/record-prod', split='train')
+        # Take the columns straight from the Arrow buffers (no per-row Python objects)
+        ds = ds.with_format('numpy', columns=['action', 'episode_index'])
+        CACHE_DIR.mkdir(exist_ok=True)
+        np.save(actions_path, np.ascontiguousarray(ds['action'][:], dtype=np.float32))
+        np.save(episodes_path, ds['episode_index'][:])
+    return np.load(actions_path, mmap_mode='r'), np.load(episodes_path, mmap_mode='r')
 
 def main():
     print("Loading dataset...")
-    ds = load_dataset('Jbutch/record-prod', split='train')
+    actions, episode_indices = load_columns()
 
-    actions = np.array(ds['action'])
-    episode_indices = np.array(ds['episode_index'])
-    num_episodes = len(set(episode_indices))
+    # Group rows by episode so each episode is one contiguous block
+    if np.any(np.diff(episode_indices) < 0):
+        order = np.argsort(episode_indices, kind='stable')
+        actions, episode_indices = actions[order], episode_indices[order]
+    _, episode_starts, episode_lengths = np.unique(episode_indices, return_index=True, return_counts=True)
+    num_episodes = len(episode_starts)
 
     # Calculate variance metrics
-    overall_variance = actions.var(axis=0)
-    overall_std = actions.std(axis=0)
+    overall_variance = actions.var(axis=0, dtype=np.float64)
+    overall_std = np.sqrt(overall_variance)
 
-    # Per-episode variance
-    episode_variances = []
-    for ep in range(num_episodes):
-        mask = episode_indices == ep
-        ep_var = actions[mask].var(axis=0)
-        episode_variances.append(ep_var)
-    episode_variances = np.array(episode_variances)
+    # Per-episode mean and variance
+    episode_means, episode_variances = episode_mean_var(actions, episode_starts, episode_lengths)
 
     # Cross-episode variance (variance of episode means)
-    episode_means = np.array([actions[episode_indices == ep].mean(axis=0) for ep in range(num_episodes)])
     cross_episode_variance = episode_means.var(axis=0)
 
     # Create figure with 4 subplots
@@ -65,7 +105,7 @@ def main():
 
     # Plot 3: Variance per episode (heatmap)
     ax3 = axes[1, 0]
-    im = ax3.imshow(episode_variances.T, aspect='auto', cmap='YlOrRd')
+    im = ax3.imshow(episode_variances.T, aspect='auto', cmap='YlOrRd', rasterized=True)
     ax3.set_yticks(range(len(MOTOR_NAMES)))
     ax3.set_yticklabels(MOTOR_NAMES)
     ax3.set_xticks(range(num_episodes))
@@ -78,15 +118,13 @@ def main():
     # Plot 4: Rolling variance over time (all episodes concatenated)
     ax4 = axes[1, 1]
     window = 50  # Rolling window size
-    for i, name in enumerate(MOTOR_NAMES):
-        # Calculate rolling variance
-        data = actions[:, i]
-        rolling_var = np.array([data[max(0, j-window):j+1].var() for j in range(len(data))])
-        ax4.plot(rolling_var, label=name, alpha=0.8, linewidth=1)
+    rolling_var = rolling_variance(actions, window)
+    stride = max(1, len(rolling_var) // MAX_PLOT_POINTS)
+    ax4.plot(np.arange(0, len(rolling_var), stride), rolling_var[::stride],
+             label=MOTOR_NAMES, alpha=0.8, linewidth=1, rasterized=True)
 
     # Add episode boundaries
-    for ep in range(1, num_episodes):
-        first_idx = np.where(episode_indices == ep)[0][0]
+    for first_idx in episode_starts[1:]:
         ax4.axvline(first_idx, color='gray', linestyle='--', alpha=0.5, linewidth=0.5)
 
     ax4.set_xlabel('Sample Index')
@@ -96,7 +134,7 @@ def main():
     ax4.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig('outputs/variance_analysis.png', dpi=150, bbox_inches='tight')
+    plt.savefig('outputs/variance_analysis.png', dpi=100, bbox_inches='tight')
     print("Saved: outputs/variance_analysis.png")
 
     # Print summary
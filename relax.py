@@ -6,14 +6,13 @@ import sys
 from dotenv import load_dotenv
 
 from lerobot.motors.feetech import FeetechMotorsBus
-from lerobot.motors.motors_bus import Motor, MotorNormMode
+
+from _motor_config import MOTOR_NAMES, MOTORS
 
 load_dotenv()
 
 LEADER_PORT = os.getenv("LEADER_ARM_PORT")
 FOLLOWER_PORT = os.getenv("FOLLOWER_ARM_PORT")
-MOTOR_NAMES = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
-MOTOR_IDS = {name: i + 1 for i, name in enumerate(MOTOR_NAMES)}
 
 
 def relax_arm(port: str, name: str) -> bool:
@@ -23,13 +22,7 @@ def relax_arm(port: str, name: str) -> bool:
         return False
 
     try:
-        bus = FeetechMotorsBus(
-            port=port,
-            motors={
-                motor_name: Motor(id=id_, model="sts3215", norm_mode=MotorNormMode.RANGE_M100_100)
-                for motor_name, id_ in MOTOR_IDS.items()
-            },
-        )
+        bus = FeetechMotorsBus(port=port, motors=MOTORS)
         bus.connect()
         bus.sync_write("Torque_Enable", {n: 0 for n in MOTOR_NAMES}, normalize=False)
         bus.sync_write("Lock", {n: 0 for n in MOTOR_NAMES}, normalize=False)
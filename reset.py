@@ -6,13 +6,12 @@ import time
 from dotenv import load_dotenv
 
 from lerobot.motors.feetech import FeetechMotorsBus
-from lerobot.motors.motors_bus import Motor, MotorNormMode
+
+from _motor_config import MOTOR_NAMES, MOTORS
 
 load_dotenv()
 
 FOLLOWER_PORT = os.getenv("FOLLOWER_ARM_PORT")
-MOTOR_NAMES = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
-MOTOR_IDS = {name: i + 1 for i, name in enumerate(MOTOR_NAMES)}
 
 HOME_POSITION = {
     "shoulder_pan": 2034,
@@ -30,13 +29,7 @@ def main():
         return
 
     print(f"Connecting to follower ({FOLLOWER_PORT})...")
-    bus = FeetechMotorsBus(
-        port=FOLLOWER_PORT,
-        motors={
-            name: Motor(id=id_, model="sts3215", norm_mode=MotorNormMode.RANGE_M100_100)
-            for name, id_ in MOTOR_IDS.items()
-        },
-    )
+    bus = FeetechMotorsBus(port=FOLLOWER_PORT, motors=MOTORS)
     bus.connect()
 
     print("Moving to home position...")
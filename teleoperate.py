@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Teleoperate the follower arm using the leader arm."""
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 from rich.console import Console
@@ -17,6 +20,44 @@ LEADER_PORT = os.getenv("LEADER_ARM_PORT")
 FOLLOWER_PORT = os.getenv("FOLLOWER_ARM_PORT")
 
 
+def read_leader(teleop, actions, stop):
+    """Keep only the newest leader action in `actions` until `stop` is set."""
+    try:
+        while not stop.is_set():
+            action = teleop.get_action()
+            # Replace a stale action the follower hasn't picked up yet
+            try:
+                actions.get_nowait()
+            except queue.Empty:
+                pass
+            actions.put_nowait(action)
+    except Exception as e:
+        actions.put(e)
+
+
+def connect_arms(devices):
+    """Connect the arms in parallel, then calibrate any that need it one at a time."""
+    try:
+        # The arms are on separate serial ports, so their handshakes can run in parallel.
+        # Calibration prompts on stdin, so it's kept out of the threads and the spinner.
+        with console.status("[bold]Connecting..."), ThreadPoolExecutor(max_workers=len(devices)) as executor:
+            for future in [executor.submit(device.connect, calibrate=False) for device in devices]:
+                future.result()
+        for device in devices:
+            if not device.is_calibrated:
+                device.calibrate()
+                device.configure()
+    except BaseException:
+        # Don't leave one arm connected when the other failed
+        for device in devices:
+            if device.is_connected:
+                try:
+                    device.disconnect()
+                except Exception:
+                    pass
+        raise
+
+
 def main():
     console.print(f"[dim]Leader:[/dim]   {LEADER_PORT}")
     console.print(f"[dim]Follower:[/dim] {FOLLOWER_PORT}")
@@ -24,19 +65,28 @@ def main():
     robot = SO101Follower(SO101FollowerConfig(port=FOLLOWER_PORT, id="follower_arm"))
     teleop = SO101Leader(SO101LeaderConfig(port=LEADER_PORT, id="leader_arm"))
 
-    with console.status("[bold]Connecting..."):
-        robot.connect()
-        teleop.connect()
+    connect_arms([robot, teleop])
 
     console.print("[green]Connected[/green] — Move leader to control follower")
     console.print("[dim]Ctrl+C to stop[/dim]\n")
 
+    # Read the leader on its own thread so its bus transfer overlaps the follower's write
+    actions = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    reader = threading.Thread(target=read_leader, args=(teleop, actions, stop), daemon=True)
+    reader.start()
+
     try:
         while True:
-            robot.send_action(teleop.get_action())
+            action = actions.get()
+            if isinstance(action, Exception):
+                raise action
+            robot.send_action(action)
     except KeyboardInterrupt:
         console.print("\n[yellow]Stopping...[/yellow]")
     finally:
+        stop.set()
+        reader.join(timeout=1.0)
         teleop.disconnect()
         robot.disconnect()
         console.print("[dim]Disconnected[/dim]")
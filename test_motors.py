@@ -1,45 +1,131 @@
 #!/usr/bin/env python3
 """Interactive motor testing for SO-101 arms."""
 import os
+import selectors
+import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 
-import yaml
-from dotenv import load_dotenv
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10
+    import tomli as tomllib
+
 from rich.console import Console
 from rich.table import Table
-from rich.prompt import Prompt, IntPrompt
+from rich.prompt import Prompt
 from rich.panel import Panel
+from rich.progress import Progress
 
-from lerobot.motors.feetech import FeetechMotorsBus
-from lerobot.motors.motors_bus import Motor, MotorNormMode
-
-load_dotenv()
+from _motor_config import MOTOR_IDS, MOTOR_NAMES
 
 console = Console()
-CONFIG_PATH = Path(__file__).parent / "config.yaml"
-LEADER_PORT = os.getenv("LEADER_ARM_PORT")
-FOLLOWER_PORT = os.getenv("FOLLOWER_ARM_PORT")
-MOTOR_NAMES = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
-MOTOR_IDS = {name: i + 1 for i, name in enumerate(MOTOR_NAMES)}
+CONFIG_PATH = Path(__file__).parent / "config.toml"
+ALL_OFF = {name: 0 for name in MOTOR_NAMES}
+ALL_ON = {name: 1 for name in MOTOR_NAMES}
 
 
+@lru_cache(maxsize=1)
 def load_config():
-    with open(CONFIG_PATH) as f:
-        return yaml.safe_load(f)
+    """Load config.toml. Parsed once per process: edits take effect on the next run."""
+    with CONFIG_PATH.open("rb") as f:
+        return tomllib.load(f)
 
 
 def select_arm():
     """Prompt user to select which arm to control."""
+    # .env is only read once the ports are actually needed
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    leader_port = os.getenv("LEADER_ARM_PORT")
+    follower_port = os.getenv("FOLLOWER_ARM_PORT")
+
     console.print("\n[bold]Select arm:[/bold]")
-    console.print(f"  [cyan]1[/cyan] Leader   [dim]({LEADER_PORT})[/dim]")
-    console.print(f"  [cyan]2[/cyan] Follower [dim]({FOLLOWER_PORT})[/dim]")
+    console.print(f"  [cyan]1[/cyan] Leader   [dim]({leader_port})[/dim]")
+    console.print(f"  [cyan]2[/cyan] Follower [dim]({follower_port})[/dim]")
 
     while True:
         choice = Prompt.ask("Choice", choices=["1", "2"])
         if choice == "1":
-            return "leader", LEADER_PORT
-        return "follower", FOLLOWER_PORT
+            return "leader", leader_port
+        return "follower", follower_port
+
+
+def set_torque(bus, enabled):
+    """Enable (and lock) or disable (and unlock) torque on every motor.
+
+    Torque_Enable (40) and Lock (55) aren't adjacent, so they can't share one sync
+    write; both are transmit-only packets and go out back-to-back.
+    """
+    values = ALL_ON if enabled else ALL_OFF
+    bus.sync_write("Torque_Enable", values, normalize=False)
+    bus.sync_write("Lock", values, normalize=False)
+
+
+def enable_torque(bus, torque, names):
+    """Write Torque_Enable=1 to the motors in `names` that `torque` says are still off."""
+    pending = {name: 1 for name in names if not torque[name]}
+    if pending:
+        bus.sync_write("Torque_Enable", pending, normalize=False)
+        torque.update(dict.fromkeys(pending, True))
+
+
+def wait_until_reached(bus, targets, tol=20, timeout=1.0):
+    """Poll until every motor in `targets` is within `tol` steps of its goal.
+
+    Polls start 5ms apart and back off to 100ms. Returns False if `timeout` runs out first.
+    """
+    names = list(targets)
+    deadline = time.monotonic() + timeout
+    pause = 0.005
+    while True:
+        positions = bus.sync_read("Present_Position", names, normalize=False)
+        if all(abs(positions[name] - targets[name]) <= tol for name in names):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(pause, remaining))
+        pause = min(pause * 2, 0.1)
+
+
+def read_command(prompt, on_idle=None, interval=0.1):
+    """Read a line from the user, calling `on_idle` every `interval` seconds while waiting.
+
+    Falls back to a plain blocking prompt where stdin can't be polled (Windows, piped input).
+    """
+    if on_idle is None or os.name == "nt" or not sys.stdin.isatty():
+        return Prompt.ask(prompt)
+
+    console.print(f"{prompt}: ", end="")
+    with selectors.DefaultSelector() as selector:
+        selector.register(sys.stdin, selectors.EVENT_READ)
+        while not selector.select(interval):
+            on_idle()
+    # Straight from the fd: a pasted line left in sys.stdin's buffer would be invisible to
+    # select(). A terminal hands back at most one line per read.
+    line = os.read(sys.stdin.fileno(), 4096)
+    if not line:
+        raise EOFError
+    return line.decode(sys.stdin.encoding, errors="replace")
+
+
+def set_low_latency(port):
+    """Drop the USB-serial latency timer from 16ms to 1ms, if the adapter has one.
+
+    Only FTDI adapters on Linux expose it; other ports are left alone. Writing it needs
+    root or the udev rule in the README.
+    """
+    timer = Path("/sys/bus/usb-serial/devices") / Path(port).resolve().name / "latency_timer"
+    try:
+        if timer.read_text().strip() != "1":
+            timer.write_text("1")
+    except FileNotFoundError:
+        pass
+    except OSError:
+        console.print(f"[dim]Couldn't lower the latency timer on {port} (see README)[/dim]")
 
 
 def show_positions(bus, title="Motor Positions"):
@@ -58,15 +144,14 @@ def show_positions(bus, title="Motor Positions"):
 def main():
     arm_name, port = select_arm()
 
+    # The motor stack pulls in torch, so it is only imported once an arm has been chosen
+    from lerobot.motors.feetech import FeetechMotorsBus
+    from _motor_config import MOTORS
+
     with console.status(f"[bold]Connecting to {arm_name} arm..."):
-        bus = FeetechMotorsBus(
-            port=port,
-            motors={
-                name: Motor(id=id_, model="sts3215", norm_mode=MotorNormMode.RANGE_M100_100)
-                for name, id_ in MOTOR_IDS.items()
-            },
-        )
+        bus = FeetechMotorsBus(port=port, motors=MOTORS)
         bus.connect()
+        set_low_latency(port)
 
     console.print(f"[green]Connected to {arm_name} arm[/green]")
 
@@ -74,72 +159,120 @@ def main():
     default_positions = config["default_position"][arm_name]
 
     # Relax arm on start
-    bus.sync_write("Torque_Enable", {name: 0 for name in MOTOR_NAMES}, normalize=False)
-    bus.sync_write("Lock", {name: 0 for name in MOTOR_NAMES}, normalize=False)
+    set_torque(bus, False)
+    # Torque_Enable/Lock as last written, so repeated commands skip redundant writes
+    torque = dict.fromkeys(MOTOR_NAMES, False)
+    locked = False
     console.print("[dim]Arm relaxed[/dim]\n")
 
+    # Most recent full position read, reused while fresh instead of another round-trip
+    last_read = {"positions": {}, "time": 0.0}
+
+    def show_status():
+        # Live positions go in the window title so they never disturb what's being typed
+        try:
+            positions = bus.sync_read("Present_Position", MOTOR_NAMES, normalize=False)
+        except ConnectionError:
+            return  # Dropped status packet: try again on the next tick
+        last_read.update(positions=positions, time=time.monotonic())
+        console.set_window_title(f"{arm_name}: " + " ".join(str(pos) for pos in positions.values()))
+
     menu = """[bold cyan]r[/bold cyan] read   [bold cyan]m[/bold cyan] move   [bold cyan]s[/bold cyan] sequence   [bold cyan]return[/bold cyan] default
-[bold cyan]relax[/bold cyan] free   [bold cyan]hold[/bold cyan] lock   [bold cyan]q[/bold cyan] quit"""
+[bold cyan]s1[/bold cyan] sequence, one motor at a time   [bold cyan]relax[/bold cyan] free   [bold cyan]hold[/bold cyan] lock   [bold cyan]q[/bold cyan] quit"""
+    # Built once and reprinted each time round the loop
+    menu_panel = Panel(menu, title=f"[bold]{arm_name.upper()}[/bold]", border_style="blue")
+    motor_table = Table(show_header=False, box=None)
+    for i, name in enumerate(MOTOR_NAMES):
+        motor_table.add_row(f"[cyan]{i+1}[/cyan]", name)
 
     while True:
-        console.print(Panel(menu, title=f"[bold]{arm_name.upper()}[/bold]", border_style="blue"))
-        cmd = Prompt.ask("[bold]>[/bold]").strip().lower()
+        console.print(menu_panel)
+        cmd = read_command("[bold]>[/bold]", on_idle=show_status).strip().lower()
 
         if cmd == "q":
             break
 
         elif cmd == "r":
-            show_positions(bus)
+            last_read.update(positions=show_positions(bus), time=time.monotonic())
 
-        elif cmd == "s":
-            offset, delay = 300, 0.5
-            console.print(f"[dim]Sequence: ±{offset} steps, {delay}s delay[/dim]")
+        elif cmd in ("s", "s1"):
+            offset, timeout = 300, 1.0
+            console.print(f"[dim]Sequence: ±{offset} steps, up to {timeout}s per move[/dim]")
             current = bus.sync_read("Present_Position", MOTOR_NAMES, normalize=False)
-            bus.sync_write("Torque_Enable", {name: 1 for name in MOTOR_NAMES}, normalize=False)
-
-            for name in MOTOR_NAMES:
-                pos = current[name]
-                console.print(f"  [cyan]{name}[/cyan]", end=" ")
-                for target in [min(4095, pos + offset), max(0, pos - offset), pos]:
-                    bus.sync_write("Goal_Position", {name: target}, normalize=False)
-                    time.sleep(delay)
-                console.print("[green]✓[/green]")
-
+            # Goal writes for the whole sequence: +offset, -offset, back to start
+            import numpy as np  # Only the sequence needs it; kept off the startup path
+
+            positions = np.fromiter(current.values(), dtype=np.int16, count=len(current))
+            phases = [
+                dict(zip(current, np.clip(positions + offset, 0, 4095).tolist())),
+                dict(zip(current, np.clip(positions - offset, 0, 4095).tolist())),
+                current,
+            ]
+            if cmd == "s":
+                # Joints are independent, so all six move together: three writes in total
+                waypoints = {"all motors": phases}
+            else:
+                waypoints = {name: [{name: phase[name]} for phase in phases] for name in MOTOR_NAMES}
+            enable_torque(bus, torque, MOTOR_NAMES)
+
+            timed_out = []
+            with Progress(console=console) as progress:
+                task = progress.add_task("Sequence", total=len(waypoints))
+                for name, targets in waypoints.items():
+                    progress.update(task, description=f"[cyan]{name}[/cyan]")
+                    reached = True
+                    for target in targets:
+                        bus.sync_write("Goal_Position", target, normalize=False)
+                        reached &= wait_until_reached(bus, target, timeout=timeout)
+                    if not reached:
+                        timed_out.append(name)
+                    progress.advance(task)
+
+            if timed_out:
+                console.print(f"[yellow]Timed out: {', '.join(timed_out)}[/yellow]")
             console.print("[green]Sequence complete[/green]")
 
         elif cmd == "return":
             with console.status("[bold]Moving to default position..."):
-                bus.sync_write("Torque_Enable", {name: 1 for name in MOTOR_NAMES}, normalize=False)
+                enable_torque(bus, torque, MOTOR_NAMES)
                 bus.sync_write("Goal_Position", default_positions, normalize=False)
-                time.sleep(1.0)
-            console.print("[green]At default position[/green]")
+                reached = wait_until_reached(bus, default_positions, tol=15, timeout=1.5)
+            if reached:
+                console.print("[green]At default position[/green]")
+            else:
+                console.print("[yellow]Timed out before reaching default position[/yellow]")
 
         elif cmd == "relax":
-            bus.sync_write("Torque_Enable", {name: 0 for name in MOTOR_NAMES}, normalize=False)
-            bus.sync_write("Lock", {name: 0 for name in MOTOR_NAMES}, normalize=False)
+            if locked or any(torque.values()):
+                set_torque(bus, False)
+                torque.update(dict.fromkeys(MOTOR_NAMES, False))
+                locked = False
             console.print("[green]Relaxed[/green]")
 
         elif cmd == "hold":
-            bus.sync_write("Torque_Enable", {name: 1 for name in MOTOR_NAMES}, normalize=False)
-            bus.sync_write("Lock", {name: 1 for name in MOTOR_NAMES}, normalize=False)
+            if not (locked and all(torque.values())):
+                set_torque(bus, True)
+                torque.update(dict.fromkeys(MOTOR_NAMES, True))
+                locked = True
             console.print("[green]Holding[/green]")
 
         elif cmd == "m":
-            table = Table(show_header=False, box=None)
-            for i, name in enumerate(MOTOR_NAMES):
-                table.add_row(f"[cyan]{i+1}[/cyan]", name)
-            console.print(table)
+            console.print(motor_table)
 
             try:
-                motor_num = IntPrompt.ask("Motor", default=1) - 1
+                motor_num = int(read_command("Motor [cyan](1)[/cyan]", on_idle=show_status).strip() or 1) - 1
                 if 0 <= motor_num < len(MOTOR_NAMES):
                     motor_name = MOTOR_NAMES[motor_num]
-                    bus.sync_write("Torque_Enable", {motor_name: 1}, normalize=False)
+                    enable_torque(bus, torque, [motor_name])
                     console.print(f"[bold]{motor_name}[/bold] [dim](exit to return)[/dim]")
 
+                    # The idle poll kept positions fresh while the motor was being picked
+                    current = last_read["positions"] if time.monotonic() - last_read["time"] < 0.5 else None
                     while True:
-                        current = bus.sync_read("Present_Position", [motor_name], normalize=False)
+                        if current is None:
+                            current = bus.sync_read("Present_Position", [motor_name], normalize=False)
                         response = Prompt.ask(f"[dim]{current[motor_name]}[/dim] →")
+                        current = None
 
                         if response.lower() == "exit":
                             break
@@ -157,8 +290,9 @@ def main():
             except ValueError:
                 console.print("[red]Invalid input[/red]")
 
-    bus.sync_write("Torque_Enable", {name: 0 for name in MOTOR_NAMES}, normalize=False)
+    bus.sync_write("Torque_Enable", ALL_OFF, normalize=False)
     bus.disconnect()
+    console.set_window_title("")
     console.print("[dim]Disconnected[/dim]")
 
 